@@ -10,11 +10,19 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# True when the settings are loaded by the test runner
+# (either 'manage.py test' or pytest)
+TESTING = (
+    (len(sys.argv) > 1 and sys.argv[1] == 'test')
+    or 'pytest' in sys.modules
+)
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
@@ -89,6 +97,14 @@ DATABASES = {
     }
 }
 
+# Running the tests outside docker-compose (no DB_HOST) uses an in-memory
+# SQLite database for a faster local loop; CI keeps testing on PostgreSQL
+if TESTING and not os.environ.get('DB_HOST'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -108,6 +124,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2 hashes new passwords; the other hashers still verify passwords
+# stored before it was added and upgrade them on the next login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Password hashing is the slowest part of creating test users; the tests
+# don't need a secure hash, so use a cheap one when running them
+if TESTING:
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
@@ -46,6 +46,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = UserManager()
 
@@ -64,6 +65,14 @@ class Recipe(models.Model):
     tags = models.ManyToManyField('Tag')
     ingredients = models.ManyToManyField('ingredient')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # matches the user filter and newest-first ordering of the API
+        indexes = [
+            models.Index(fields=['user', '-id'],
+                         name='recipe_user_id_desc_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -75,6 +84,12 @@ class Tag(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-name'],
+                         name='tag_user_name_desc_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -85,5 +100,11 @@ class Ingredient(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-name'],
+                         name='ingredient_user_name_desc_idx'),
+        ]
+
     def __str__(self):
         return self.name
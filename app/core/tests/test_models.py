@@ -3,7 +3,7 @@
 from decimal import Decimal
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
@@ -17,6 +17,10 @@ def create_user(email='user@example.com', password='testpass1234'):
 class ModelTests(TestCase):
     """Test models"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def test_create_user_with_email_successful(self):
         """Test createing a user with an email address is successful"""
         email = 'test@example.com'
@@ -38,15 +42,15 @@ class ModelTests(TestCase):
             ['test4@example.COM', 'test4@example.com'],
         ]
 
+        # normalization is pure python, so check it without saving users
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, 'sample123')
-            self.assertEqual(user.email, expected)
+            self.assertEqual(
+                get_user_model().objects.normalize_email(email), expected)
 
-    def test_new_user_without_email_raises_error(self):
-        """Tests creating a user without an email
-        raises an exception/error"""
-        with self.assertRaises(ValueError):
-            get_user_model().objects.create_user('', 'test1234')
+        # and make sure create_user applies it
+        email, expected = sample_emails[0]
+        user = get_user_model().objects.create_user(email, 'sample123')
+        self.assertEqual(user.email, expected)
 
     def test_create_superuser(self):
         user = get_user_model().objects.create_superuser(
@@ -59,13 +63,8 @@ class ModelTests(TestCase):
 
     def test_create_recipe(self):
         """Test creating a recipe ins uccessful"""
-        user = get_user_model().objects.create_user(
-            'test@example.com',
-            'testpass123',
-        )
-
         recipe = models.Recipe.objects.create(
-            user=user,
+            user=self.user,
             title='Sample recipe name',
             time_minutes=5,
             price=Decimal('5.50'),
@@ -76,21 +75,29 @@ class ModelTests(TestCase):
 
     def test_create_tag(self):
         """Test creating a tag is successful"""
-        user = create_user()
-        tag = models.Tag.objects.create(user=user, name='Tag1')
+        tag = models.Tag.objects.create(user=self.user, name='Tag1')
 
         self.assertEqual(str(tag), tag.name)
 
     def test_create_ingredient(self):
         """Test creating an ingredient is successful"""
-        user = create_user()
         ingredient = models.Ingredient.objects.create(
-            user=user,
+            user=self.user,
             name='Ingredient1'
         )
 
         self.assertEqual(str(ingredient), ingredient.name)
 
+
+class ModelLogicTests(SimpleTestCase):
+    """Test model logic that runs without the database"""
+
+    def test_new_user_without_email_raises_error(self):
+        """Tests creating a user without an email
+        raises an exception/error"""
+        with self.assertRaises(ValueError):
+            get_user_model().objects.create_user('', 'test1234')
+
     @patch('core.models.uuid.uuid4')
     def test_recipe_file_name_uuid(self, mock_uuid):
         """Tests generating an image path in the system"""
@@ -1,5 +1,7 @@
 """Serializers for recipe APIs"""
 
+from django.db import transaction
+
 from rest_framework import serializers
 
 from core.models import (
@@ -38,24 +40,35 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'price', 'link', 'tags', 'ingredients']
         read_only_fields = ['id']
 
+    def _get_or_create_objects(self, model, items):
+        """Returns the user's tags or ingredients named in items, creating
+        the missing ones with a single insert"""
+        auth_user = self.context['request'].user
+        names = list(dict.fromkeys(item['name'] for item in items))
+        if not names:
+            return []
+
+        queryset = model.objects.filter(user=auth_user, name__in=names)
+        existing = set(queryset.values_list('name', flat=True))
+        model.objects.bulk_create([
+            model(user=auth_user, name=name)
+            for name in names if name not in existing
+        ])
+
+        return list(queryset)
+
     def _get_or_create_tags(self, tags, recipe):
         """Handles getting or creating tags in a recipe as needed"""
-        auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user, **tag
-            )
-            recipe.tags.add(tag_obj)
+        recipe.tags.add(*self._get_or_create_objects(Tag, tags))
 
     def _get_or_create_ingredients(self, ingredients, recipe):
         """Hanldes getting or creating ingredients in a recipe as needed"""
-        auth_user = self.context['request'].user
-        for ingredient in ingredients:
-            ingredient_obj, created = Ingredient.objects.get_or_create(
-                user=auth_user, **ingredient)
-            recipe.ingredients.add(ingredient_obj)
+        recipe.ingredients.add(
+            *self._get_or_create_objects(Ingredient, ingredients))
 
     # custom logic to creating a recipe using this serializer
+    # the recipe and its tags and ingredients are written in one transaction
+    @transaction.atomic
     def create(self, validated_data):
         """Create a recipe"""
         tags = validated_data.pop('tags', [])
@@ -65,6 +78,7 @@ class RecipeSerializer(serializers.ModelSerializer):
         self._get_or_create_ingredients(ingredients, recipe)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Update a recipe"""
         tags = validated_data.pop('tags', None)
@@ -0,0 +1,32 @@
+"""Model factories for the recipe API tests"""
+
+from decimal import Decimal
+
+import factory
+
+from core.models import (
+    Recipe,
+    Ingredient
+)
+
+
+class RecipeFactory(factory.django.DjangoModelFactory):
+    """Builds sample recipes; the user is passed in by the test"""
+
+    class Meta:
+        model = Recipe
+
+    title = factory.Sequence(lambda n: f'Sample title {n}')
+    time_minutes = 20
+    description = 'The quick brown fox jumps over the lazy dog'
+    price = Decimal('4.55')
+    link = 'https://www.example.com/recipe.pdf'
+
+
+class IngredientFactory(factory.django.DjangoModelFactory):
+    """Builds sample ingredients; the user is passed in by the test"""
+
+    class Meta:
+        model = Ingredient
+
+    name = factory.Sequence(lambda n: f'Ingredient {n}')
@@ -1,6 +1,7 @@
-"""Tests for the tags APIs"""
+"""Tests for the ingredients APIs"""
 
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -12,11 +13,13 @@ from rest_framework.test import APIClient
 from core.models import Ingredient, Recipe
 
 from recipe.serializers import IngredientSerializer
+from recipe.tests.factories import IngredientFactory
 
 
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(ingredient_url):
     """Creates and returns an ingredient detail url"""
     return reverse('recipe:ingredient-detail', args=[ingredient_url])
@@ -30,8 +33,7 @@ def create_user(email='user@example.com', password='testpass2234'):
 class PublicIngredientsApiTests(TestCase):
     """Tests for unauthenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_is_needed(self):
         """Tests authentication is needed when retrieving ingredients"""
@@ -43,16 +45,19 @@ class PublicIngredientsApiTests(TestCase):
 class PrivateIngredientsApiTests(TestCase):
     """Tests auhtenticated requests to ingredients endpoint"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
         """Tests retrieving a list of tags for authenticated user"""
         # creating ingredients for the authenticated user
-        Ingredient.objects.create(user=self.user, name='Oatmeal')
-        Ingredient.objects.create(user=self.user, name='Banana')
+        IngredientFactory.create_batch(2, user=self.user)
 
         res = self.client.get(INGREDIENTS_URL)
         ingredients = Ingredient.objects.all().order_by('-name')
@@ -136,8 +141,11 @@ class PrivateIngredientsApiTests(TestCase):
             price=Decimal('4.50'),
             user=self.user,
         )
-        rec1.ingredients.add(ing)
-        rec2.ingredients.add(ing)
+        through = Recipe.ingredients.through
+        through.objects.bulk_create([
+            through(recipe=rec1, ingredient=ing),
+            through(recipe=rec2, ingredient=ing),
+        ])
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
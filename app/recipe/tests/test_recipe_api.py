@@ -1,13 +1,16 @@
 """Tests for recipe APIs"""
 
 from decimal import Decimal
-import tempfile
+from functools import lru_cache
+from unittest.mock import patch
+import base64
 import os
 
-from PIL import Image
-
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -23,15 +26,29 @@ from recipe.serializers import (
     RecipeSerializer,
     RecipeDetailSerializer
 )
+from recipe.tests.factories import RecipeFactory
+from recipe.views import RecipeCursorPagination
 
 RECIPES_URL = reverse('recipe:recipe-list')
 
+# 10x10 black JPEG, encoded once here rather than on every test run
+SAMPLE_JPEG = base64.b64decode(
+    '/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8U'
+    'HRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/2wBDAQkJCQwLDBgN'
+    'DRgyIRwhMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIy'
+    'MjIyMjL/wAARCAAKAAoDASIAAhEBAxEB/8QAFQABAQAAAAAAAAAAAAAAAAAAAAj/xAAU'
+    'EAEAAAAAAAAAAAAAAAAAAAAA/8QAFAEBAAAAAAAAAAAAAAAAAAAAAP/EABQRAQAAAAAA'
+    'AAAAAAAAAAAAAAD/2gAMAwEAAhEDEQA/AJ/AB//Z'
+)
+
 
+@lru_cache(maxsize=None)
 def image_upload_url(recipe_id):
     """Creates and returns an image upload URL"""
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
 
 
+@lru_cache(maxsize=None)
 def detail_url(recipe_id):
     """Creates and returns a recipe detail url"""
     return reverse('recipe:recipe-detail', args=[recipe_id])
@@ -39,20 +56,7 @@ def detail_url(recipe_id):
 
 def create_recipe(user, **params):
     """Create and return a sample recipe for testing"""
-    defaults = {
-        'title': 'Sample title',
-        'time_minutes': 20,
-        'description': 'The quick brown fox jumps \
-            over the lazy dog',
-        'price': Decimal('4.55'),
-        'link': 'hhtps://www.example.com/recipe.pdf',
-    }
-
-    defaults.update(params)
-
-    recipe = Recipe.objects.create(user=user, **defaults)
-
-    return recipe
+    return RecipeFactory(user=user, **params)
 
 
 def create_user(**params):
@@ -63,8 +67,7 @@ def create_user(**params):
 class PublicRecipeApiTests(TestCase):
     """Test unauthenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test authentication is reuired to call API"""
@@ -76,23 +79,75 @@ class PublicRecipeApiTests(TestCase):
 class PrivateRecipeApiTests(TestCase):
     """Test authenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    # TestCase builds a fresh client for every test; making it an
+    # APIClient saves constructing a second one in setUp
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='user@example.com', password='testpass123')
+
+    def setUp(self):
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_recipes(self):
         """Test retrieving a list of recipes"""
+        RecipeFactory.create_batch(2, user=self.user)
+
+        # ETag lookup, recipes, tags and ingredients, however many
+        # recipes there are
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(path=RECIPES_URL)
+
+        self.assertLessEqual(len(queries), 4)
+
+        recipe_ids = Recipe.objects.filter(
+            user=self.user).order_by('-id').values_list('id', flat=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['id'] for r in res.data['results']],
+                         list(recipe_ids))
+
+    @patch.object(RecipeCursorPagination, 'page_size', 2)
+    def test_retrieve_recipes_paginated(self):
+        """Test the recipe list is paged by cursor, newest first"""
+        recipes = RecipeFactory.create_batch(3, user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual([r['id'] for r in res.data['results']],
+                         [recipes[2].id, recipes[1].id])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual([r['id'] for r in res.data['results']],
+                         [recipes[0].id])
+        self.assertIsNone(res.data['next'])
+
+    def test_retrieve_unchanged_recipes_not_modified(self):
+        """Test a list matching the client's ETag returns 304"""
         create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        # a quoted entity-tag with no spaces (RFC 7232)
+        self.assertRegex(res['ETag'], r'^"[^" ]+"$')
 
-        res = self.client.get(path=RECIPES_URL)
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_recipe_etag_changes_when_tag_updated(self):
+        """Test renaming a recipe's tag invalidates the recipe's ETag"""
+        tag = Tag.objects.create(user=self.user, name='Lunch')
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(tag)
+        url = detail_url(recipe.id)
+        etag = self.client.get(url)['ETag']
+
+        self.client.patch(reverse('recipe:tag-detail', args=[tag.id]),
+                          {'name': 'Dinner'})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
 
-        recipes = Recipe.objects.all().order_by('-id')
-        serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['tags'][0]['name'], 'Dinner')
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is liited to authenticated user,
@@ -105,10 +160,11 @@ class PrivateRecipeApiTests(TestCase):
 
         res = self.client.get(path=RECIPES_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        recipe_ids = Recipe.objects.filter(
+            user=self.user).order_by('-id').values_list('id', flat=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual([r['id'] for r in res.data['results']],
+                         list(recipe_ids))
 
     def test_get_recipe_detail(self):
         """Test get details of a recipe"""
@@ -171,7 +227,7 @@ class PrivateRecipeApiTests(TestCase):
             'link': 'http://example.com/recipe2.pdf',
             'description': 'New sample recipe description',
             'time_minutes': 10,
-            'price': Decimal(2.50),
+            'price': Decimal('2.50'),
         }
 
         url = detail_url(recipe_id=recipe.id)
@@ -229,7 +285,7 @@ class PrivateRecipeApiTests(TestCase):
             'link': 'http://example.com/overnight-oats.pdf',
             'description': 'Oats that you leave overnight',
             'time_minutes': 5,
-            'price': Decimal(4.99),
+            'price': Decimal('4.99'),
             'tags': [
                 {'name': 'Dinner'},
                 {'name': 'Snack'},
@@ -244,12 +300,10 @@ class PrivateRecipeApiTests(TestCase):
 
         recipe = recipes[0]
         self.assertEqual(recipe.tags.count(), 3)
+        tag_names = set(
+            recipe.tags.filter(user=self.user).values_list('name', flat=True))
         for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+            self.assertIn(tag['name'], tag_names)
 
     def test_create_recipe_with_already_existing_tags(self):
         """Tests creating a crecipe with an arleady-existing tag"""
@@ -260,7 +314,7 @@ class PrivateRecipeApiTests(TestCase):
             'description': 'Visuvio pizza, pizza with spicy \
                 salami and fior de latte',
             'time_minutes': 30,
-            'price': Decimal(4.99),
+            'price': Decimal('4.99'),
             'tags': [
                 {'name': 'Junk'},
                 {'name': 'Lunch'},
@@ -277,12 +331,10 @@ class PrivateRecipeApiTests(TestCase):
         self.assertEqual(recipe.tags.count(), 3)
         self.assertIn(tag_italian, recipe.tags.all())
 
+        tag_names = set(
+            recipe.tags.filter(user=self.user).values_list('name', flat=True))
         for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+            self.assertIn(tag['name'], tag_names)
 
     def test_create_tag_on_updating_recipe(self):
         """Test creating a tag while updating recipe"""
@@ -342,7 +394,7 @@ class PrivateRecipeApiTests(TestCase):
             'link': 'http://example.com/overnight-oats.pdf',
             'description': 'Oats that you leave overnight',
             'time_minutes': 5,
-            'price': Decimal(4.99),
+            'price': Decimal('4.99'),
             'tags': [
                 {'name': 'Dinner'},
                 {'name': 'Snack'},
@@ -363,10 +415,10 @@ class PrivateRecipeApiTests(TestCase):
         recipe = recipes[0]
 
         self.assertEqual(recipe.ingredients.count(), 2)
+        ingredient_names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
         for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user, name=ingredient['name']).exists()
-            self.assertTrue(exists)
+            self.assertIn(ingredient['name'], ingredient_names)
 
     def test_create_recipe_with_already_existing_ingredients(self):
         """Test creating a recipe with an already-existsing ingredient"""
@@ -377,7 +429,7 @@ class PrivateRecipeApiTests(TestCase):
             'link': 'http://example.com/overnight-oats.pdf',
             'description': 'Oats that you leave overnight',
             'time_minutes': 5,
-            'price': Decimal(4.99),
+            'price': Decimal('4.99'),
             'tags': [
                 {'name': 'Dinner'},
                 {'name': 'Snack'},
@@ -398,10 +450,10 @@ class PrivateRecipeApiTests(TestCase):
 
         self.assertEqual(recipe.ingredients.count(), 2)
         self.assertIn(ingredient, recipe.ingredients.all())
+        ingredient_names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
         for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user, name=ingredient['name']).exists()
-            self.assertTrue(exists)
+            self.assertIn(ingredient['name'], ingredient_names)
 
     def test_create_ingredient_on_updating_recipe(self):
         """Test creating an ingredient while updating recipe"""
@@ -477,9 +529,9 @@ class PrivateRecipeApiTests(TestCase):
         s2 = RecipeSerializer(rec2)
         s3 = RecipeSerializer(rec3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
 
     def test_filter_by_ingredients(self):
         """Tests filtering recipes by ingredients"""
@@ -501,22 +553,26 @@ class PrivateRecipeApiTests(TestCase):
         s2 = RecipeSerializer(rec2)
         s3 = RecipeSerializer(rec3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
 
 
 class ImageUploadTests(TestCase):
     """Tests for the image upload API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email='user@example.com',
             password='testpass1234'
         )
+        cls.recipe = create_recipe(user=cls.user)
+
+    def setUp(self):
         self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
 
     def tearDown(self):
         self.recipe.image.delete()
@@ -524,14 +580,11 @@ class ImageUploadTests(TestCase):
     def test_upload_valid_image(self):
         """Test uploading a valid image to a recipe"""
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, format='JPEG')
-            image_file.seek(0)
-            payload = {
-                'image': image_file
-            }
-            res = self.client.post(url, payload, format='multipart')
+        payload = {
+            'image': SimpleUploadedFile(
+                'image.jpg', SAMPLE_JPEG, content_type='image/jpeg')
+        }
+        res = self.client.post(url, payload, format='multipart')
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
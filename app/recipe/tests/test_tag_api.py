@@ -1,6 +1,7 @@
 """Tests for the tags APIs"""
 
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -17,6 +18,7 @@ from recipe.serializers import TagSerializer
 TAGS_URL = reverse('recipe:tag-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(tag_id):
     """Creates and returns a tag detail url"""
     return reverse('recipe:tag-detail', args=[tag_id])
@@ -30,8 +32,7 @@ def create_user(email='user@example.com', password='testpass1234'):
 class PublicTagsApiTests(TestCase):
     """Tests unauthenticated API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_is_needed(self):
         """Tetss authentication is needed for retrieving tags"""
@@ -43,9 +44,13 @@ class PublicTagsApiTests(TestCase):
 class PrivateTagsApiTests(TestCase):
     """Tests authenticated reuqests"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
@@ -61,6 +66,16 @@ class PrivateTagsApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_retrieve_tags_uses_single_query(self):
+        """Tests listing tags doesn't query per tag"""
+        Tag.objects.create(user=self.user, name='Vegetarian')
+        Tag.objects.create(user=self.user, name='Vegan')
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
     def test_tags_are_limited_to_user(self):
         """Tests list of tags is limited to the authenticated user"""
         # creating a user with a tag
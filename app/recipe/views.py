@@ -7,6 +7,11 @@ from drf_spectacular.utils import (
     OpenApiTypes,
 )
 
+from django.db.models import Count, Max, Prefetch
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 from rest_framework import (
     viewsets,
     mixins,
@@ -14,6 +19,7 @@ from rest_framework import (
 )
 
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
@@ -27,6 +33,35 @@ from core.models import (
 )
 
 
+def recipes_etag(request, pk=None, **kwargs):
+    """Build an ETag from the state of the authenticated user's recipes,
+    so unchanged lists and details can be answered with 304 Not Modified"""
+    queryset = Recipe.objects.filter(user=request.user)
+    if pk is not None:
+        try:
+            queryset = queryset.filter(pk=pk)
+        except (TypeError, ValueError):
+            return None
+
+    stamp = queryset.aggregate(count=Count('id'),
+                               last_updated=Max('updated_at'))
+    if pk is not None and not stamp['count']:
+        # let the view return its 404
+        return None
+
+    # an empty list has no last update; the user's pk keeps the tags of
+    # different users' empty lists apart
+    last_updated = stamp['last_updated']
+    timestamp = last_updated.timestamp() if last_updated else 0
+    return f'{request.user.pk}-{stamp["count"]}-{timestamp}'
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Page recipes by id, newest first, without counting them"""
+    ordering = '-id'
+    page_size = 20
+
+
 @extend_schema_view(
     list=extend_schema(
         parameters=[
@@ -43,10 +78,26 @@ from core.models import (
         ]
     )
 )
+@method_decorator(condition(etag_func=recipes_etag), name='list')
+@method_decorator(condition(etag_func=recipes_etag), name='retrieve')
 class RecipeViewSet(viewsets.ModelViewSet):
     """View to manage recipe APIs"""
     serializer_class = serializers.RecipeDetailSerializer
+    # serializers for actions that don't use serializer_class
+    action_serializer_classes = {
+        'list': serializers.RecipeSerializer,
+        'upload_image': serializers.RecipeImageSerializer,
+    }
+    # columns loaded for actions that don't need the whole row; saving a
+    # partially loaded recipe only writes these, so upload_image keeps
+    # updated_at to mark the recipe as changed
+    action_fields = {
+        'list': ['id', 'title', 'time_minutes', 'price', 'link'],
+        'upload_image': ['id', 'image', 'updated_at'],
+        'destroy': ['id'],
+    }
     queryset = Recipe.objects.all()
+    pagination_class = RecipeCursorPagination
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
@@ -67,18 +118,32 @@ class RecipeViewSet(viewsets.ModelViewSet):
             ingredient_ids = self._params_to_ints(ingredients)
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
 
-        return queryset.filter(
-            user=self.request.user).order_by('-id').distinct()
+        queryset = queryset.filter(user=self.request.user)
+        fields = self.action_fields.get(self.action)
+        if fields:
+            queryset = queryset.only(*fields)
+
+        # updates rewrite the relations and reload them afterwards, so
+        # only the read actions benefit from prefetching
+        if self.action in ('list', 'retrieve'):
+            queryset = self.prefetch_queryset(queryset)
+
+        return queryset.order_by('-id').distinct()
+
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load the tags and ingredients of the recipes in queryset with
+        one query each, fetching only the columns their serializers use"""
+        return queryset.prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.only('id', 'name')),
+            Prefetch('ingredients',
+                     queryset=Ingredient.objects.only('id', 'name')),
+        )
 
     def get_serializer_class(self):
         """Return the serializer class for a request"""
-        if self.action == 'list':
-            return serializers.RecipeSerializer
-
-        elif self.action == 'upload_image':
-            return serializers.RecipeImageSerializer
-
-        return self.serializer_class
+        return self.action_serializer_classes.get(
+            self.action, self.serializer_class)
 
     def perform_create(self, serializer):
         """Create a new recipe"""
@@ -116,6 +181,21 @@ class BaseRecipeAttributesViewSet(mixins.UpdateModelMixin,
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def _touch_recipes(self, instance):
+        """Mark the recipes using instance as updated, so their
+        cached representations are no longer treated as current"""
+        instance.recipe_set.update(updated_at=timezone.now())
+
+    def perform_update(self, serializer):
+        """Update the object"""
+        serializer.save()
+        self._touch_recipes(serializer.instance)
+
+    def perform_destroy(self, instance):
+        """Delete the object"""
+        self._touch_recipes(instance)
+        instance.delete()
+
     def get_queryset(self):
         """Filters queryset to the authenticated user"""
         assigned_only = bool(
@@ -123,10 +203,12 @@ class BaseRecipeAttributesViewSet(mixins.UpdateModelMixin,
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            # the join to recipes repeats a row per recipe, so only this
+            # case needs the database to de-duplicate
+            queryset = queryset.filter(recipe__isnull=False).distinct()
 
         return queryset.filter(
-            user=self.request.user).order_by('-name').distinct()
+            user=self.request.user).order_by('-name')
 
 
 class TagViewSet(BaseRecipeAttributesViewSet):
@@ -1,5 +1,7 @@
 """Serializers for the user api view"""
 
+import copy
+
 from django.contrib.auth import (
     get_user_model,
     authenticate
@@ -9,12 +11,28 @@ from django.utils.translation import gettext as _
 from rest_framework import serializers
 
 
-class UserSerializer(serializers.ModelSerializer):
+User = get_user_model()
+
+
+class CachedFieldsMixin:
+    """Build a model serializer's fields once per class and give each
+    instance its own copy, instead of introspecting the model per request"""
+
+    def get_fields(self):
+        cls = type(self)
+        # look in the class's own __dict__ so subclasses build their own
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        # fields are bound to their serializer, so they can't be shared
+        return copy.deepcopy(cls._cached_fields)
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the user object; for registering
     users and for updating users"""
 
     class Meta:
-        model = get_user_model()
+        model = User
         fields = ['email', 'password', 'name']
         extra_kwargs = {
             'password': {
@@ -25,7 +43,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """create and return a user with encrypted password"""
-        return get_user_model().objects.create_user(**validated_data)
+        return User.objects.create_user(**validated_data)
 
     def update(self, instance, validated_data):
         """Update and return user
@@ -34,13 +52,28 @@ class UserSerializer(serializers.ModelSerializer):
         serializer validation (email, password, and name)
         """
         password = validated_data.pop('password', None)
-        user = super().update(instance=instance, validated_data=validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        update_fields = list(validated_data)
 
         if password:
-            user.set_password(password)
-            user.save()
+            instance.set_password(password)
+            update_fields.append('password')
 
-        return user
+        # a single UPDATE limited to the fields that were sent
+        if update_fields:
+            instance.save(update_fields=update_fields + ['updated_at'])
+
+        return instance
+
+
+class UserReadSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Serializer for reading the user profile"""
+
+    class Meta:
+        model = User
+        fields = ['email', 'name']
+        read_only_fields = fields
 
 
 class AuthTokenSerializer(serializers.Serializer):
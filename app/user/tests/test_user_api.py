@@ -1,12 +1,18 @@
 """Tests for the user api"""
 
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from user.serializers import UserSerializer, UserReadSerializer
+
+
+User = get_user_model()
 
 CREATE_USER_URL = reverse('user:create')
 TOKEL_URL = reverse('user:token')
@@ -17,14 +23,13 @@ def create_user(**params):
     """Create and return a new user
     params: a dict that contains parameters
     to pass to the user"""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
 class PublicUserApiTests(TestCase):
     """Tests the public features of the user api"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_create_user_success(self):
         """Tests creating a user is successful"""
@@ -35,11 +40,11 @@ class PublicUserApiTests(TestCase):
             'name': 'John Doe',
         }
 
-        res = self.client.post(path=CREATE_USER_URL, data=payload)
+        res = self.client.post(CREATE_USER_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         # retrives object from the with the email that was in the payload
-        user = get_user_model().objects.get(email=payload['email'])
+        user = User.objects.get(email=payload['email'])
         self.assertTrue(user.check_password(payload['password']))
         self.assertNotIn('password', res.data)
 
@@ -54,7 +59,7 @@ class PublicUserApiTests(TestCase):
 
         create_user(**payload)
 
-        res = self.client.post(path=CREATE_USER_URL, data=payload)
+        res = self.client.post(CREATE_USER_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
@@ -67,11 +72,11 @@ class PublicUserApiTests(TestCase):
             'name': 'John Doe',
         }
 
-        res = self.client.post(path=CREATE_USER_URL, data=payload)
+        res = self.client.post(CREATE_USER_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
         # making sure the user was not created
-        user_exists = get_user_model().objects.filter(
+        user_exists = User.objects.filter(
             email=payload['email']
             ).exists()
         self.assertFalse(user_exists)
@@ -91,7 +96,7 @@ class PublicUserApiTests(TestCase):
             'password': user_details['password'],
         }
 
-        res = self.client.post(path=TOKEL_URL, data=payload)
+        res = self.client.post(TOKEL_URL, payload, format='json')
 
         self.assertIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -105,7 +110,7 @@ class PublicUserApiTests(TestCase):
             'password': 'invalidpass'
         }
 
-        res = self.client.post(path=TOKEL_URL, data=payload)
+        res = self.client.post(TOKEL_URL, payload, format='json')
 
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -119,7 +124,7 @@ class PublicUserApiTests(TestCase):
             'password': '',
         }
 
-        res = self.client.post(path=TOKEL_URL, data=payload)
+        res = self.client.post(TOKEL_URL, payload, format='json')
 
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -136,13 +141,17 @@ class PublicUserApiTests(TestCase):
 class PrivateUserApiTests(TestCase):
     """Test API requests that require authentication"""
 
-    def setUp(self):
-        self.user = create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='test@example.com',
             password='testpass123',
             name='John Doe',
         )
-        self.client = APIClient()
+
+    def setUp(self):
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_profile_succes(self):
@@ -155,9 +164,29 @@ class PrivateUserApiTests(TestCase):
             'name': self.user.name
         })
 
+    def test_retrieve_unchanged_profile_not_modified(self):
+        """Test retrieving an unchanged profile returns 304"""
+        res = self.client.get(ME_URL)
+        self.assertIn('private', res['Cache-Control'])
+
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn('private', res['Cache-Control'])
+
+    def test_profile_etag_changes_when_updated(self):
+        """Test updating the profile invalidates its ETag"""
+        etag = self.client.get(ME_URL)['ETag']
+        self.client.patch(ME_URL, {'name': 'New Name'}, format='json')
+
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['name'], 'New Name')
+
     def test_post_me_not_allowed(self):
         """Test POST is not allowed for the ME endpoint"""
-        res = self.client.post(path=ME_URL, data={})
+        res = self.client.post(ME_URL, {}, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
@@ -168,9 +197,55 @@ class PrivateUserApiTests(TestCase):
             'password': 'newpassword1234',
         }
 
-        res = self.client.patch(path=ME_URL, data=payload)
+        res = self.client.patch(ME_URL, payload, format='json')
 
         self.user.refresh_from_db()
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_update_user_profile_single_update(self):
+        """Test updating the profile writes the user row only once"""
+        payload = {
+            'name': 'New Name',
+            'password': 'newpassword1234',
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.patch(ME_URL, payload, format='json')
+
+        updates = [q for q in ctx.captured_queries
+                   if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+
+
+class UserSerializerFieldsTests(SimpleTestCase):
+    """Test the fields cached by the user serializers"""
+
+    def test_serializers_get_own_fields(self):
+        """Test each serializer instance gets its own bound fields"""
+        first = UserSerializer().fields
+        second = UserSerializer().fields
+
+        self.assertEqual(list(first), ['email', 'password', 'name'])
+        self.assertEqual(list(second), list(first))
+        self.assertIsNot(first['email'], second['email'])
+        self.assertIsNot(first['email'].parent, second['email'].parent)
+
+    def test_subclass_fields_not_shared(self):
+        """Test a subclass builds its own fields after its parent"""
+        class NameSerializer(UserSerializer):
+            class Meta(UserSerializer.Meta):
+                fields = ['name']
+
+        UserSerializer().fields
+
+        self.assertEqual(list(NameSerializer().fields), ['name'])
+        self.assertEqual(list(UserSerializer().fields),
+                         ['email', 'password', 'name'])
+
+    def test_sibling_serializer_fields_not_shared(self):
+        """Test the read serializer doesn't reuse the write fields"""
+        UserSerializer().fields
+
+        self.assertEqual(list(UserReadSerializer().fields), ['email', 'name'])
@@ -1,11 +1,17 @@
 """Views for the user api"""
 
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+
 from rest_framework import generics, authentication, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
 from user.serializers import (
     UserSerializer,
+    UserReadSerializer,
     AuthTokenSerializer,
 )
 
@@ -21,6 +27,17 @@ class CreateTokenView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
+def profile_etag(request, *args, **kwargs):
+    """Build an ETag from the authenticated user's last change, so an
+    unchanged profile can be answered with 304 Not Modified"""
+    return f'{request.user.pk}-{request.user.updated_at.timestamp()}'
+
+
+# the profile is per user and changes on update, so clients revalidate
+# it with the ETag instead of reusing a stale copy
+@method_decorator(cache_control(private=True, no_cache=True), name='get')
+@method_decorator(vary_on_headers('Authorization'), name='get')
+@method_decorator(condition(etag_func=profile_etag), name='get')
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user"""
     serializer_class = UserSerializer
@@ -30,3 +47,11 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         """Retrieve and return the authenticated user"""
         return self.request.user
+
+    def get_serializer_class(self):
+        """Return the serializer class for a request"""
+        # reads don't need the password field and its validators
+        if self.request.method in permissions.SAFE_METHODS:
+            return UserReadSerializer
+
+        return self.serializer_class